@@ -15,11 +15,13 @@ st.set_page_config(
 # =========================
 
 import os                                  # misc utilities
+import hashlib                             # fingerprints for cached answers
 import re                                  # regex for extraction
 import uuid                                # to generate per-user IDs
 from datetime import datetime              # timestamps if you need them
 from streamlit_cookies_manager import EncryptedCookieManager  # per-user cookie IDs
 from supabase import create_client         # Supabase client
+from postgrest import APIError             # PostgREST errors (e.g. PGRST202)
 
 # ---- Theme / CSS (lightweight) ----
 st.markdown("""                               
@@ -42,9 +44,17 @@ h1, h2, h3 { letter-spacing:.3px; }
 
 SUPABASE_URL = st.secrets["SUPABASE_URL"].strip()                  # Supabase URL
 SUPABASE_SERVICE_KEY = st.secrets["SUPABASE_SERVICE_KEY"].strip()  # Service key (server-side)
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)       # Supabase client
+
+@st.cache_resource                                                 # one client per process
+def get_supabase():
+    """Return the shared Supabase client (reused across reruns, sessions and threads)."""
+    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+supabase = get_supabase()                                          # Supabase client
 
 TABLE_NAME = "Memories"                                            # table name
+PAGE_SIZE = 50                                                     # rows per "Load more" page
+MAX_BATCH_SIZE = 100                                               # rows per insert request
 
 
 # =======================================
@@ -70,37 +80,181 @@ if not user_id:                                                   # if missing,
 # 4) DB HELPERS: LOAD & SAVE MEMORIES
 # ======================================
 
-def load_memories_from_db(user_id: str, search_term: str = "") -> list[dict]:
-    """Return a list of memories for this user, optionally filtered by a search term."""
+def _to_memories(rows: list[dict]) -> list[dict]:
+    """Map Supabase rows to the app's one memory shape, once per fetch:
+    {"id", "ts" (raw timestamp, the paging cursor), "created_at" ("2025-05-03 16:30"),
+    "text", "importance"}.
+    """
+    return [
+        {
+            "id": r.get("id"),
+            "ts": r.get("created_at") or "",
+            "created_at": (r.get("created_at") or "")[:16].replace("T", " "),
+            "text": r.get("memory_text") or "",
+            "importance": int(r.get("importance", 3)),
+        }
+        for r in rows
+    ]
+
+
+def _like_escape(text: str) -> str:
+    """Backslash-escape LIKE wildcards so `text` matches literally ("50%" → "50\\%")."""
+    return re.sub(r"([\\%_])", r"\\\1", text)
+
+
+@st.cache_resource(ttl=600)                                        # process-wide; re-probe every 10 min
+def _missing_rpcs() -> set[str]:
+    """Names of RPCs PostgREST reported as not deployed, so they aren't retried.
+
+    Expires (and is reset by "Clear cache") so a migration applied while the
+    app is running gets picked up without a restart.
+    """
+    return set()
+
+
+@st.cache_data(ttl=60, show_spinner=False)                        # reuse rows across reruns
+def _fetch_memories(user_id: str, search_term: str,
+                    before: tuple[str, int] | None, limit: int | None) -> list[dict]:
+    """Query Supabase for this user's memories (cached per argument tuple).
+
+    Search terms go through the `search_memories` RPC (trigram-indexed ILIKE);
+    a leading "^" asks for memories that start with the term instead
+    (`search_memories_prefix`, B-tree range scan).
+    Rows come newest first; `before` = (ts, id) of the last row already shown
+    returns only older ones (keyset paging), `limit` caps the count (None = all).
+    Raises on DB errors so failures are never cached; see load_memories_from_db.
+    """
+    def _window(q):                                               # newest first, after the cursor
+        q = q.order("created_at", desc=True).order("id", desc=True)  # id breaks ties (batch inserts)
+        if before:                                                # index seek, not OFFSET
+            ts, last_id = before
+            q = q.or_(f'created_at.lt."{ts}",and(created_at.eq."{ts}",id.lt.{last_id})')
+        return q if limit is None else q.limit(limit)
+
+    term = search_term.strip()
+    prefix = term.startswith("^")                                 # "^Arse" → starts with "Arse"
+    if prefix:
+        term = term[1:].strip()
+    rpc = "search_memories_prefix" if prefix else "search_memories"
+    if term and rpc not in _missing_rpcs():                       # case-insensitive match
+        try:
+            arg = term if prefix else _like_escape(term)          # search_memories runs ILIKE
+            resp = _window(supabase.rpc(rpc, {"uid": user_id, "q": arg})
+                                   .select("id, created_at, memory_text, importance")).execute()
+            return _to_memories(resp.data or [])                  # normalize
+        except APIError as e:
+            if e.code != "PGRST202":                              # only "function not found"
+                raise
+            _missing_rpcs().add(rpc)                              # not deployed → plain query from now on
+    q = (supabase.table(TABLE_NAME)                               # base query
+                 .select("id, created_at, memory_text, importance")
+                 .eq("user_id", user_id))
+    if term:                                                      # fallback: unindexed ilike
+        lit = _like_escape(term)                                  # "_" / "%" in the term are literal
+        q = q.ilike("memory_text", f"{lit}%" if prefix else f"%{lit}%")
+    resp = _window(q).execute()                                   # run
+    return _to_memories(resp.data or [])                          # normalize
+
+
+def load_memories_from_db(user_id: str, search_term: str = "",
+                          before: tuple[str, int] | None = None,
+                          limit: int | None = None) -> list[dict]:
+    """Return a list of memories for this user, optionally filtered by a search term.
+
+    Pass `limit` to get one page (newest first) and `before` = (m["ts"], m["id"])
+    of the previous page's last memory to get the next one.
+    """
     if not user_id:                                               # guard
         return []                                                 # nothing to query
     try:                                                          # handle DB errors cleanly
-        q = (supabase.table(TABLE_NAME)                           # base query
-                     .select("id, created_at, memory_text, importance")
-                     .eq("user_id", user_id)
-                     .order("created_at", desc=True))
-        if search_term.strip():                                   # case-insensitive contains
-            q = q.ilike("memory_text", f"%{search_term.strip()}%")
-        resp = q.execute()                                        # run
-        return resp.data or []                                    # normalize
+        return _fetch_memories(user_id, search_term, before, limit)  # cached fetch
     except Exception as e:                                        # show error but don't crash UI
         st.error(f"Error loading memories: {e}")
         return []                                                 # safe fallback
 
 
-def save_memory_to_db(user_id: str, text: str, importance: int = 3) -> bool:
-    """Insert a memory row for this user."""
+@st.cache_data(ttl=60, show_spinner=False)                        # same reuse as above
+def _rank_memories(user_id: str, question: str, k: int) -> list[dict]:
+    """Run the `rank_memories` RPC (cached per argument tuple).
+
+    Raises on DB errors so failures are never cached; see rank_memories_in_db.
+    """
+    resp = (supabase.rpc("rank_memories", {"uid": user_id, "q": question, "k": k})
+                    .select("id, created_at, memory_text, importance")
+                    .execute())
+    return _to_memories(resp.data or [])                          # normalize
+
+
+def rank_memories_in_db(user_id: str, question: str, k: int = 50) -> list[dict] | None:
+    """Return up to k memories ranked by full-text relevance to the question.
+
+    Ranking runs in Postgres (`rank_memories` RPC, GIN-indexed tsvector), so only
+    the best candidates cross the wire. Returns None if the RPC isn't available
+    or failed, letting the caller fall back to the full history.
+    """
+    if not user_id or not question.strip():                       # guard
+        return []
+    if "rank_memories" in _missing_rpcs():                        # not deployed → skip the round trip
+        return None
     try:
-        payload = {                                               # row payload
-            "user_id": user_id,
-            "memory_text": text.strip(),
-            "importance": int(importance),
-        }
-        _ = supabase.table(TABLE_NAME).insert(payload).execute()  # insert
-        return True                                               # success
+        return _rank_memories(user_id, question.strip(), k)       # cached fetch
+    except APIError as e:
+        if e.code == "PGRST202":                                  # only "function not found"
+            _missing_rpcs().add("rank_memories")
+        else:
+            st.error(f"Error ranking memories: {e}")
+        return None                                               # caller falls back
+    except Exception as e:                                        # show error but don't crash UI
+        st.error(f"Error ranking memories: {e}")
+        return None                                               # caller falls back
+
+
+def _clear_read_caches() -> None:
+    """Drop cached reads after a write so the next render refetches."""
+    _fetch_memories.clear()
+    _rank_memories.clear()
+
+
+def _memory_payload(user_id: str, text: str, importance: int = 3) -> dict:
+    """Row payload for one memory."""
+    return {
+        "user_id": user_id,
+        "memory_text": text.strip(),
+        "importance": int(importance),
+    }
+
+
+def save_memories_batch(user_id: str, items: list[tuple[str, int]]) -> list[dict] | None:
+    """Insert many (text, importance) memories for this user; return the stored rows.
+
+    Sends one insert per MAX_BATCH_SIZE rows instead of one per memory.
+    Returns None if nothing was stored; if a later chunk fails, returns the
+    rows already committed (and says how many were saved).
+    """
+    payloads = [_memory_payload(user_id, text, imp) for text, imp in items if text.strip()]
+    stored: list[dict] = []
+    try:
+        for i in range(0, len(payloads), MAX_BATCH_SIZE):
+            chunk = payloads[i:i + MAX_BATCH_SIZE]
+            resp = supabase.table(TABLE_NAME).insert(chunk).execute()  # one request per chunk
+            stored += _to_memories(resp.data or chunk)            # rows as stored
+        return stored                                             # success
     except Exception as e:
-        st.error(f"Couldn't save memory: {e}")                    # surface error
-        return False                                              # failure
+        if not stored:
+            st.error(f"Couldn't save memory: {e}")                # surface error
+            return None                                           # failure
+        st.error(f"Saved the first {len(stored)} of {len(payloads)} memories; "
+                 f"couldn't save the rest: {e}")                  # partial: don't re-paste all
+        return stored                                             # keep what was committed
+    finally:
+        if stored:                                                # anything written?
+            _clear_read_caches()                                  # next read sees it
+
+
+def save_memory_to_db(user_id: str, text: str, importance: int = 3) -> dict | None:
+    """Insert a memory row for this user; return the stored row (None on failure)."""
+    rows = save_memories_batch(user_id, [(text, importance)])
+    return rows[0] if rows else None
 # ==============================================================
 # ================================================================
 # 5) Q&A MATCHER — clean, second-person answers with personality
@@ -110,6 +264,7 @@ def save_memory_to_db(user_id: str, text: str, importance: int = 3) -> bool:
 
 # 5.1 Imports / stopwords ----------------------------------------
 import re  # keep near top if you already import re elsewhere
+import numpy as np  # vectorised scoring over all memories
 
 STOPWORDS = {
     "a","an","the","is","are","to","of","and","on","at","by","for","in","with",
@@ -118,9 +273,11 @@ STOPWORDS = {
 }
 
 # 5.2 Tiny tokenizer ---------------------------------------------
+_TOKEN_RE = re.compile(r"[a-z0-9']+")  # compiled once at import
+
 def _tokens(text: str) -> list[str]:
     """Lowercase, alnum tokens minus stopwords."""
-    words = re.findall(r"[a-z0-9']+", (text or "").lower())
+    words = _TOKEN_RE.findall((text or "").lower())
     return [w for w in words if w not in STOPWORDS]
 
 # --- Multi-task detection + scoring helpers (NEW) ----------------
@@ -130,15 +287,35 @@ MULTI_Q_HINTS = (
     "what are all", "what do i have", "what should i do"
 )
 
+# all hints folded into one pattern → a single scan over the question
+_MULTI_Q_RE = re.compile("|".join(re.escape(h) for h in MULTI_Q_HINTS))
+
 def _wants_multi(question: str) -> bool:
     q = (question or "").lower()
-    return any(h in q for h in MULTI_Q_HINTS)
-
-def _score_overlap(q_tokens: set[str], text: str) -> int:
-    m_tokens = set(_tokens(text))
-    return len(q_tokens & m_tokens)
+    return _MULTI_Q_RE.search(q) is not None
 
 # 5.3 Convert first-person → second-person ------------------------
+# one lowercase phrase → replacement table, matched in a single pass
+_SECOND_PERSON_TABLE = {
+    "i am": "You are",
+    "i'm": "You're",
+    "i’ve": "You’ve",
+    "i’d": "You’d",
+    "i’ll": "You’ll",
+    "i": "You",
+    "my": "your",
+    "me": "you",
+    "our": "your",
+    "ours": "yours",
+    "we": "you",
+    "us": "you",
+}
+# longest first so "I am" wins over "I" and "ours" over "our"
+_SECOND_PERSON_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(k) for k in sorted(_SECOND_PERSON_TABLE, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
 def _to_second_person(text: str) -> str:
     """
     Very light rewrite so answers speak to the user.
@@ -147,24 +324,8 @@ def _to_second_person(text: str) -> str:
     if not text:
         return ""
 
-    # order matters; do longest first
-    repl = [
-        (r"\bI am\b", "You are"),
-        (r"\bI'm\b", "You're"),
-        (r"\bI’ve\b", "You’ve"),
-        (r"\bI’d\b", "You’d"),
-        (r"\bI’ll\b", "You’ll"),
-        (r"\bI\b", "You"),
-        (r"\bmy\b", "your"),
-        (r"\bme\b", "you"),
-        (r"\bour\b", "your"),
-        (r"\bours\b", "yours"),
-        (r"\bwe\b", "you"),
-        (r"\bus\b", "you"),
-    ]
-    out = " " + text + " "
-    for pat, sub in repl:
-        out = re.sub(pat, sub, out, flags=re.IGNORECASE)
+    # IGNORECASE also matches e.g. "ſ"/"İ", whose lower() isn't a key → leave those as-is
+    out = _SECOND_PERSON_RE.sub(lambda m: _SECOND_PERSON_TABLE.get(m.group(0).lower(), m.group(0)), text)
     return out.strip().rstrip(".")  # keep it tidy
 
 # 5.4 Pickle’s personality tag (domain-aware) --------------------
@@ -200,32 +361,64 @@ def personality_response(memory_text, question):
     
     return response
 
-# 5.5 Choose best memory for a question --------------------------
-def _pick_best_memory(question: str, memories: list[dict]) -> dict | None:
+# 5.5 Inverted index (per session, grown incrementally) ----------
+def _inv_index() -> dict:
+    """
+    This session's index: "postings" maps token → set of memory ids,
+    "importance" maps memory id → importance (doubles as the indexed-ids set).
+    """
+    return st.session_state.setdefault("inv_idx", {"postings": {}, "importance": {}})
+
+def _index_add(m: dict) -> None:
+    """Tokenize one memory into the session index (once per memory id)."""
+    idx = _inv_index()
+    mid = m["id"]
+    if mid is None or mid in idx["importance"]:
+        return
+    idx["importance"][mid] = m["importance"]
+    for tok in set(_tokens(m["text"])):
+        idx["postings"].setdefault(tok, set()).add(mid)
+
+def _score_memories(q_tokens: frozenset[str], memories: list[dict]) -> tuple[list[dict], np.ndarray]:
+    """
+    Return the memories sharing a token with the question (in list order) and
+    their scores: overlap * 10 + importance (overlap dominates; importance nudges).
+    Memories are tokenized once, the first time the session sees them, and
+    overlap is counted from the question tokens' posting lists. Still O(N) per
+    question: one cheap pass over `memories` maps ids to list positions.
+    """
+    idx = _inv_index()
+    pos = {}
+    for i, m in enumerate(memories):
+        mid = m["id"]
+        if mid not in idx["importance"]:
+            _index_add(m)
+        pos[mid] = i
+
+    overlap: dict = {}
+    for t in q_tokens:
+        for mid in idx["postings"].get(t, ()):
+            if mid in pos:                                        # restrict to the given list
+                overlap[mid] = overlap.get(mid, 0) + 1
+
+    cand_ids = sorted(overlap, key=pos.__getitem__)
+    scores = np.array([overlap[mid] * 10 + idx["importance"][mid] for mid in cand_ids], dtype=np.int32)
+    return [memories[pos[mid]] for mid in cand_ids], scores
+
+# 5.6 Choose best memory for a question --------------------------
+def _pick_best_memory(q_tokens: frozenset[str], memories: list[dict]) -> dict | None:
     """
     Score each memory by token overlap + small importance boost; return best.
-    Memory shape assumed: { 'memory_text': str, 'importance': int, ... }
+    Takes the question's tokens (computed once by the caller).
+    Memory shape assumed: { 'id', 'text': str, 'importance': int, ... }
     """
-    if not memories:
-        return None
-
-    q_tokens = set(_tokens(question))
-    if not q_tokens:
+    if not memories or not q_tokens:
         return None
 
-    best = None
-    best_score = -1
-    for m in memories:
-        text = m.get("memory_text", "") or m.get("text", "")
-        m_tokens = set(_tokens(text))
-        overlap = len(q_tokens & m_tokens)
-        score = overlap * 10 + int(m.get("importance", 3))  # overlap dominates; importance nudges
-        if score > best_score:
-            best, best_score = m, score
+    cands, scores = _score_memories(q_tokens, memories)
+    return cands[int(np.argmax(scores))] if cands else None  # first max = most recent on ties
 
-    return best if best_score > 0 else None
-
-# 5.6 Public API used by the UI
+# 5.7 Public API used by the UI
 def answer_question_from_memories(question: str, memories: list[dict]) -> str:
     """
     Returns a short second-person answer with personality.
@@ -235,41 +428,44 @@ def answer_question_from_memories(question: str, memories: list[dict]) -> str:
     if not memories:
         return "I don't know."
 
-    q_tokens = set(_tokens(question))
+    q_tokens = frozenset(_tokens(question))  # tokenized once, passed down
     if not q_tokens:
         return "I don't know."
 
-    # Rank memories by simple token overlap
-    ranked = []
-    for m in memories:
-        text = m.get("memory_text", "") or m.get("text", "")
-        if not text:
-            continue
-        score = _score_overlap(q_tokens, text)
-        if score > 0:
-            # slight importance boost if present
-            score = score * 10 + int(m.get("importance", 3))
-            ranked.append((score, text))
-
-    if not ranked:
-        return "I don't know."
-
-    ranked.sort(key=lambda t: t[0], reverse=True)
-
     # If the question sounds like a list/today/todo → combine several
     if _wants_multi(question):
-        top_texts = [t for _, t in ranked[:5]]  # show up to 5 items
-        if not top_texts:
+        # Rank candidate memories (posting-list hits) by overlap + importance
+        cands, scores = _score_memories(q_tokens, memories)
+        if not cands:
             return "I don't know."
-        bullets = ["• " + _to_second_person(txt) for txt in top_texts]
+        k = min(5, len(cands))                                    # show up to 5 items
+        top = np.argpartition(-scores, k - 1)[:k]                 # O(n) top-k, unordered
+        top = top[np.lexsort((top, -scores[top]))]                # order those k: score, then recency
+        bullets = ["• " + _to_second_person(cands[i]["text"]) for i in top]
         body = "\n".join(bullets)  # personality_response will add a nice opener
         return personality_response(body, question)
 
     # Otherwise return the best single match
-    best_text = ranked[0][1]
-    body = _to_second_person(best_text)
+    best = _pick_best_memory(q_tokens, memories)
+    if best is None:
+        return "I don't know."
+    body = _to_second_person(best["text"])
     return personality_response(body, question)  # keep your personality/emoji system
 
+# 5.8 Memoized answers -------------------------------------------
+def _memories_fingerprint(memories: list[dict]) -> str:
+    """Short stable hash of which memories (and versions) an answer was built from."""
+    ids = repr([(m["id"], m["created_at"], m["importance"]) for m in memories])
+    return hashlib.blake2b(ids.encode(), digest_size=16).hexdigest()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _answer_cached(question: str, fingerprint: str, _memories: list[dict]) -> str:
+    """
+    answer_question_from_memories, memoized on (question, fingerprint).
+    `_memories` is not hashed by Streamlit; the fingerprint stands in for it.
+    """
+    return answer_question_from_memories(question, _memories)
+
 # ========================== END MATCHER ==========================
 # ===================
 # 6) PAGE STRUCTURE
@@ -287,46 +483,69 @@ with left:                                                        # LEFT: save m
     st.subheader("📝 Save a new memory")
 
     # ----------------------------
-    # 1) Keep widget state in SS
+    # 1) Keep save status in SS
     # ----------------------------
-    if "memory_input" not in st.session_state:
-        st.session_state.memory_input = ""          # textarea content
-    if "importance_val" not in st.session_state:
-        st.session_state.importance_val = 3         # slider value
     if "last_save_ok" not in st.session_state:
         st.session_state.last_save_ok = None        # last save result
 
     # ----------------------------
-    # 2) Define a single callback
-    #    (runs when the Save button is clicked)
+    # 2) Define the submit callbacks
+    #    (run before the rerun, so the page below already sees the new rows)
     # ----------------------------
+    def record_saved(rows: list[dict] | None):
+        st.session_state.last_save_ok = bool(rows)
+        if rows:
+            _answer_cached.clear()                  # read caches cleared by the save
+            for row in rows:
+                _index_add(row)                     # keep Q&A index current
+
     def handle_save():
         text = st.session_state.memory_input.strip()
         imp  = int(st.session_state.importance_val)
         if text:
-            ok = save_memory_to_db(user_id, text, imp)
-            st.session_state.last_save_ok = ok
-            # SAFE reset inside callback
-            st.session_state.memory_input = ""
+            row = save_memory_to_db(user_id, text, imp)
+            record_saved([row] if row is not None else None)
+        else:
+            st.session_state.last_save_ok = None
+
+    def handle_bulk_save():
+        lines = [ln.strip() for ln in st.session_state.bulk_input.splitlines() if ln.strip()]
+        imp   = int(st.session_state.bulk_importance)
+        if lines:
+            rows = save_memories_batch(user_id, [(ln, imp) for ln in lines])  # one batch insert
+            record_saved(rows)
+            if rows and len(rows) < len(lines):     # partial save: its error says what's missing
+                st.session_state.last_save_ok = None
         else:
             st.session_state.last_save_ok = None
 
     # ----------------------------
-    # 3) Render widgets
+    # 3) Render widgets inside forms
+    #    (no rerun while typing/dragging; inputs reset after submit)
     # ----------------------------
-    st.text_area(
-        "What should I remember?",
-        key="memory_input",
-        height=120,
-        placeholder="E.g., Arsenal are playing Newcastle this Sunday at 4:30 PM"
-    )
+    with st.form("save_mem", clear_on_submit=True, border=False):
+        st.text_area(
+            "What should I remember?",
+            key="memory_input",
+            height=120,
+            placeholder="E.g., Arsenal are playing Newcastle this Sunday at 4:30 PM"
+        )
+
+        st.slider(
+            "Importance (1 low → 5 high)",
+            1, 5, 3, key="importance_val"
+        )
 
-    st.slider(
-        "Importance (1 low → 5 high)",
-        1, 5, key="importance_val"
-    )
+        st.form_submit_button("Save memory", type="primary", on_click=handle_save)
 
-    st.button("Save memory", type="primary", on_click=handle_save)
+    with st.expander("📋 Paste multiple (one per line)"):
+        with st.form("save_bulk", clear_on_submit=True, border=False):
+            st.text_area("One memory per line", key="bulk_input", height=120)
+            st.slider(
+                "Importance for all (1 low → 5 high)",
+                1, 5, 3, key="bulk_importance"
+            )
+            st.form_submit_button("Save all", on_click=handle_bulk_save)
 
     # ----------------------------
     # 4) Feedback from last action
@@ -344,29 +563,80 @@ with left:                                                        # LEFT: save m
   
 with right:                                                       # RIGHT: search + results
     st.subheader("🔎 Search memories")
-    search_term = st.text_input("Type a word to filter", placeholder="e.g., Arsenal, physio, mum")
-    filtered = load_memories_from_db(user_id, search_term)       # filtered list
-    st.write(f"Results: {len(filtered)}")
-    for m in filtered:
-        st.markdown(
-            f"- {m['memory_text']}  \n"
-            f"<span class='small-muted'>(saved {m['created_at']}, importance {m['importance']})</span>",
-            unsafe_allow_html=True
+    with st.form("search_form", border=False):                   # rerun on submit, not per edit
+        search_term = st.text_input("Type a word to filter", placeholder="e.g., Arsenal, physio, mum",
+                                    help="Start with ^ to match memories that begin with the text, e.g. ^Arsenal")
+        st.form_submit_button("Search")
+
+    def handle_clear_cache():
+        """Drop cached reads and memoized answers; the rerun refetches."""
+        _clear_read_caches()
+        _answer_cached.clear()
+        _missing_rpcs.clear()                                     # re-probe RPCs (migration applied?)
+        st.session_state.pop("last_q", None)                      # recompute this session's answer too
+
+    st.button("Clear cache", on_click=handle_clear_cache,
+              help="Refetch memories and recompute answers (e.g. after adding memories elsewhere)")
+    if st.session_state.get("mem_page_term") != search_term:     # new search → first page
+        st.session_state.mem_page_term = search_term
+        st.session_state.mem_page = 0
+
+    filtered, cursor = [], None                                   # pages 0..mem_page, each cached
+    for _ in range(st.session_state.mem_page + 1):
+        page = load_memories_from_db(user_id, search_term, cursor, PAGE_SIZE)
+        filtered += page
+        if len(page) < PAGE_SIZE:                                 # last page reached
+            break
+        cursor = (page[-1]["ts"], page[-1]["id"])                 # next page starts after this row
+    has_more = len(filtered) == (st.session_state.mem_page + 1) * PAGE_SIZE
+
+    st.write(f"Results: {len(filtered)}{'+' if has_more else ''}")
+    if len(filtered) > 20:                                        # long lists: one table element
+        st.dataframe(
+            [{"When": m["created_at"], "Importance": m["importance"], "Memory": m["text"]}
+             for m in filtered],
+            hide_index=True,
         )
+    else:                                                         # short lists: readable bullets
+        for m in filtered:
+            st.markdown(
+                f"- {m['text']}  \n"
+                f"<span class='small-muted'>(saved {m['created_at']}, importance {m['importance']})</span>",
+                unsafe_allow_html=True
+            )
+
+    def handle_load_more():
+        st.session_state.mem_page += 1
+
+    if has_more:
+        st.button("Load more", on_click=handle_load_more)
 
 st.divider()                                                      # separator below columns
 
-# ---- Q&A block ----
 # ---- Q&A block ----
 st.subheader("🧠 Ask Pickle (natural question)")
-user_q = st.text_input("Your question", placeholder="e.g., What time are Arsenal playing?")
+with st.form("ask_form", border=False):                           # rerun on submit, not per edit
+    user_q = st.text_input("Your question", placeholder="e.g., What time are Arsenal playing?")
+    st.form_submit_button("Ask")
 
 if user_q.strip():
-    # Load all user memories
-    full_memories = load_memories_from_db(user_id, "")
+    # Candidates pre-ranked by Postgres; whole history if the RPC isn't deployed,
+    # ranked nothing (its english stopwords differ from ours, e.g. "today"),
+    # or the question wants a list (top-k by ts_rank may drop due items)
+    candidates = rank_memories_in_db(user_id, user_q)
+    if not candidates or _wants_multi(user_q):
+        if not search_term.strip() and not has_more:              # results already hold everything
+            candidates = filtered                                 # → no second read this rerun
+        else:
+            candidates = load_memories_from_db(user_id, "")
 
-    # Compute the base answer
-    ans = answer_question_from_memories(user_q, full_memories)
+    # Compute the base answer (only when the question or its evidence changed)
+    key = (user_q, _memories_fingerprint(candidates))
+    if st.session_state.get("last_q") == key:
+        ans = st.session_state.last_a                             # unrelated rerun → reuse
+    else:
+        ans = _answer_cached(user_q, key[1], candidates)
+        st.session_state.last_q, st.session_state.last_a = key, ans
 
     # If no match found
     if ans == "I don't know.":
@@ -379,7 +649,7 @@ if user_q.strip():
     with st.expander("🧳 Debug (optional)"):
         st.markdown("<div class='debug-box'>", unsafe_allow_html=True)
         st.write({"question": user_q})
-        st.write({"matched_from": (full_memories[0] if full_memories else None)})
+        st.write({"matched_from": (candidates[0] if candidates else None)})
         st.markdown("</div>", unsafe_allow_html=True)
 
 else:
@@ -0,0 +1,38 @@
+-- Full-text ranking for "Ask Pickle".
+-- GIN index over the english tsvector of each memory, plus an RPC that returns
+-- a user's memories ranked by relevance to a question (used by rank_memories_in_db).
+
+create index if not exists memories_tsv_idx
+    on "Memories" using gin (to_tsvector('english', memory_text));
+
+create or replace function rank_memories(uid uuid, q text, k int default 50)
+returns setof "Memories"
+language plpgsql stable
+as $$
+declare
+    -- OR the question's lexemes: any shared word makes a candidate.
+    -- ::tsquery (not to_tsquery) so the already-stemmed lexemes aren't stemmed again.
+    tsq tsquery := replace(plainto_tsquery('english', q)::text, ' & ', ' | ')::tsquery;
+begin
+    if numnode(tsq) = 0 then
+        -- only stopwords ("Where are we?"): nothing to rank on, hand back the
+        -- latest rows so the app's own scorer still sees the user's memories
+        return query
+            select m.*
+            from "Memories" m
+            where m.user_id = uid
+            order by m.created_at desc
+            limit k;
+        return;
+    end if;
+
+    return query
+        select m.*
+        from "Memories" m
+        where m.user_id = uid
+          and to_tsvector('english', m.memory_text) @@ tsq
+        order by ts_rank(to_tsvector('english', m.memory_text), tsq) desc,
+                 m.created_at desc
+        limit k;
+end;
+$$;
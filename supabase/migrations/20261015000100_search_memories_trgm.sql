@@ -0,0 +1,19 @@
+-- Substring search for the "Search memories" box.
+-- Trigram GIN index so `memory_text ILIKE '%term%'` can use an index instead of
+-- a sequential scan, plus an RPC that runs that filter (used by _fetch_memories).
+
+create extension if not exists pg_trgm;
+
+create index if not exists memories_trgm_idx
+    on "Memories" using gin (memory_text gin_trgm_ops);
+
+create or replace function search_memories(uid uuid, q text)
+returns setof "Memories"
+language sql stable
+as $$
+    select m.*
+    from "Memories" m
+    where m.user_id = uid
+      and m.memory_text ilike '%' || q || '%'
+    order by m.created_at desc;
+$$;
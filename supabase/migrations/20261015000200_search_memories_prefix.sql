@@ -0,0 +1,23 @@
+-- Prefix search ("^Arse" in the search box): lowercase copy of memory_text with
+-- a text_pattern_ops B-tree, so "starts with" is an index range scan.
+
+alter table "Memories"
+    add column if not exists memory_text_lower text
+    generated always as (lower(memory_text)) stored;
+
+create index if not exists memories_text_lower_prefix_idx
+    on "Memories" (user_id, memory_text_lower text_pattern_ops);
+
+create or replace function search_memories_prefix(uid uuid, q text)
+returns setof "Memories"
+language sql stable
+as $$
+    -- LIKE lower(q) || '%' can't use the index (pattern isn't a plan-time
+    -- constant), so spell the prefix as the equivalent byte-wise range.
+    select m.*
+    from "Memories" m
+    where m.user_id = uid
+      and m.memory_text_lower ~>=~ lower(q)
+      and m.memory_text_lower ~<~ (lower(q) || chr(1114111))
+    order by m.created_at desc;
+$$;
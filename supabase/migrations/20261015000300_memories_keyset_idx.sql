@@ -0,0 +1,7 @@
+-- "Load more" pages by keyset (created_at, id) instead of OFFSET, so each page
+-- is an index seek past the last row shown rather than a scan of every row
+-- before it. The search RPCs are inlinable SQL functions, so the cursor filter
+-- and limit PostgREST adds on top of them are planned into the same query.
+
+create index if not exists memories_user_created_idx
+    on "Memories" (user_id, created_at desc, id desc);